@@ -8,17 +8,21 @@ Connects to Deluthium's WebSocket hub to:
 """
 
 import asyncio
-import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from decimal import Decimal
+from decimal import ROUND_DOWN, Context, Decimal, localcontext
 from enum import Enum
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Set, Tuple, Union
 
+import orjson
 import websockets
+from coincurve import PrivateKey
+from eth_abi import encode
 from eth_account import Account
-from eth_account.messages import encode_typed_data
+from eth_utils import keccak
 
 logger = logging.getLogger(__name__)
 
@@ -47,13 +51,35 @@ class RejectReason(str, Enum):
     INTERNAL_ERROR = "REJECT_REASON_INTERNAL_ERROR"
 
 
+def _addr(address: str) -> bytes:
+    """
+    Normalize a 0x-prefixed hex address to its 20 raw bytes.
+    
+    Raises:
+        ValueError: if address is not 0x followed by 40 hex digits.
+    """
+    if (
+        isinstance(address, str)
+        and len(address) == 42
+        and address[:2] in ("0x", "0X")
+    ):
+        try:
+            raw = bytes.fromhex(address[2:].lower())
+        except ValueError:
+            raw = b""
+        # fromhex skips whitespace, so 40 characters can still decode short
+        if len(raw) == 20:
+            return raw
+    raise ValueError(f"Invalid address: {address!r}")
+
+
 @dataclass
 class PriceLevel:
     price: Decimal
     amount: Decimal
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingPair:
     chain_id: int
     base_token: str
@@ -65,6 +91,63 @@ class TradingPair:
     max_order_size: Decimal = Decimal("1000.0")
     levels: List[Dict] = field(default_factory=list)
 
+    # Derived once in __post_init__ for the quote path and depth push loop
+    pair_id: str = field(init=False, repr=False, compare=False)
+    base_addr: bytes = field(init=False, repr=False, compare=False)
+    quote_addr: bytes = field(init=False, repr=False, compare=False)
+    _template: Dict = field(init=False, repr=False, compare=False)
+    _bid_factors: List[Decimal] = field(init=False, repr=False, compare=False)
+    _ask_factors: List[Decimal] = field(init=False, repr=False, compare=False)
+    _amount_wei: List[str] = field(init=False, repr=False, compare=False)
+    _min_wei: int = field(init=False, repr=False, compare=False)
+    _max_wei: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Frozen: derived fields have to bypass the generated __setattr__
+        pair_id = f"{self.base_token}-{self.quote_token}"
+        object.__setattr__(self, "pair_id", pair_id)
+        object.__setattr__(self, "base_addr", _addr(self.base_token))
+        object.__setattr__(self, "quote_addr", _addr(self.quote_token))
+        object.__setattr__(self, "_template", {
+            "type": MessageType.DEPTH_UPDATE,
+            "chain_id": self.chain_id,
+            "pair_id": pair_id,
+            "token_a": self.base_token,
+            "token_b": self.quote_token,
+        })
+        object.__setattr__(self, "_min_wei", int(self.min_order_size * WEI))
+        object.__setattr__(self, "_max_wei", int(self.max_order_size * WEI))
+        self._prepare_levels()
+
+    def _prepare_levels(self) -> None:
+        """Cache spread factors and wei amounts for each depth level."""
+        if self.levels:
+            # Tightest spread first: bids descend and asks ascend in price
+            levels = sorted(
+                self.levels, key=lambda level: level.get("spread_bps", 30)
+            )
+            bid_spreads = [level.get("spread_bps", 30) for level in levels]
+            ask_spreads = bid_spreads
+            amounts = [Decimal(str(level.get("amount", "1.0"))) for level in levels]
+        else:
+            bid_spreads = [self.bid_spread_bps]
+            ask_spreads = [self.ask_spread_bps]
+            amounts = [self.order_amount]
+        
+        object.__setattr__(
+            self, "_bid_factors", [1 - Decimal(bps) / 10000 for bps in bid_spreads]
+        )
+        object.__setattr__(
+            self, "_ask_factors", [1 + Decimal(bps) / 10000 for bps in ask_spreads]
+        )
+        object.__setattr__(
+            self, "_amount_wei", [str(int(amount * WEI)) for amount in amounts]
+        )
+
+    def _template_copy(self) -> dict:
+        """Return a fresh depth snapshot pre-filled with the static fields."""
+        return self._template.copy()
+
 
 @dataclass
 class QuoteRequest:
@@ -78,6 +161,16 @@ class QuoteRequest:
     nonce: str
     deadline: int
     slippage_bps: int
+    
+    # Raw 20-byte forms of the hex addresses above
+    token_in_addr: bytes = field(init=False, repr=False)
+    token_out_addr: bytes = field(init=False, repr=False)
+    recipient_addr: bytes = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.token_in_addr = _addr(self.token_in)
+        self.token_out_addr = _addr(self.token_out)
+        self.recipient_addr = _addr(self.recipient)
 
 
 @dataclass
@@ -100,6 +193,87 @@ WRAPPED_TOKENS = {
 }
 
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+ZERO_ADDR = bytes(20)
+
+WEI = Decimal(10**18)
+
+# On-chain amounts are 18-decimal fixed point, so 20 significant digits are
+# plenty for prices; a short context keeps the hot-path Decimal math cheap.
+DEC_CTX = Context(prec=20, rounding=ROUND_DOWN, Emin=-40, Emax=40, traps=[])
+
+# Compact heartbeat ping as sent by the hub. Anything that does not match
+# exactly simply takes the regular parse path.
+HEARTBEAT_PREFIX = '{"type":"heartbeat"'
+HEARTBEAT_PING = '"ping":true'
+
+# Outgoing heartbeat ping; only the timestamp changes between ticks
+HEARTBEAT_TEMPLATE = (
+    '{"type":"heartbeat","heartbeat":{"ping":true},"timestamp":%d}'
+)
+
+# Signed quote response frame. Slots are filled with values that never
+# need JSON escaping (hex, integers) except quote_id, which is encoded first.
+QUOTE_RESPONSE_TEMPLATE = (
+    '{"type":"quote_response","quote_id":%s,"status":"QUOTE_STATUS_SUCCESS",'
+    '"order":{"signer":"%s","manager":"%s","from":"0x%s","to":"0x%s",'
+    '"input_token":"0x%s","output_token":"0x%s","amount_in":"%d",'
+    '"amount_out":"%d","deadline":%d,"nonce":"%d","extra_data":"0x",'
+    '"signature":"0x%s"}}'
+)
+
+# Outbound frames buffered per connection before new ones are dropped
+TX_QUEUE_SIZE = 1024
+
+EIP712_DOMAIN_TYPE = (
+    b"EIP712Domain(string name,string version,uint256 chainId,"
+    b"address verifyingContract)"
+)
+MMQUOTE_TYPE = (
+    b"MMQuote(address manager,address from,address to,address inputToken,"
+    b"address outputToken,uint256 amountIn,uint256 amountOut,uint256 deadline,"
+    b"uint256 nonce,bytes32 extraDataHash)"
+)
+MMQUOTE_ABI_TYPES = (
+    "address", "address", "address", "address", "address",
+    "uint256", "uint256", "uint256", "uint256", "bytes32",
+)
+
+# Hash of empty extra data
+EXTRA_DATA_HASH = bytes.fromhex(
+    "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+)
+
+
+def _default(obj):
+    """orjson fallback for types it does not serialize natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+def _consume_result(task: asyncio.Future) -> None:
+    """Done callback that retrieves a task's exception so it is not logged."""
+    if not task.cancelled():
+        task.exception()
+
+
+async def _next_tick(
+    loop: asyncio.AbstractEventLoop, next_tick: float, interval: float
+) -> float:
+    """Sleep until the next fixed-rate tick and return its deadline."""
+    next_tick += interval
+    delay = next_tick - loop.time()
+    if delay < 0:
+        # Fell behind: drop the missed ticks instead of bursting to catch up
+        next_tick = loop.time()
+        delay = 0
+    await asyncio.sleep(delay)
+    return next_tick
+
+
+def _dumps(obj) -> str:
+    """Serialize an outgoing message to a JSON text frame."""
+    return orjson.dumps(obj, default=_default).decode()
 
 
 class DeluthiumMMConnector:
@@ -123,22 +297,75 @@ class DeluthiumMMConnector:
         signer_key: str,
         chain_id: int = 56,
         ws_url: str = "wss://mmhub.deluthium.ai/ws",
+        max_concurrent_quotes: int = 64,
+        compression: Optional[str] = None,
     ):
         self.jwt_token = jwt_token
         self.signer = Account.from_key(signer_key)
+        # libsecp256k1 key used for the actual signing; it releases the GIL
+        self._signing_key = PrivateKey(bytes(self.signer.key))
         self.chain_id = chain_id
         self.ws_url = ws_url
+        # permessage-deflate is off by default; pass "deflate" if the hub
+        # requires it
+        self.compression = compression
+        
+        # EIP-712 domain separator and MMQuote type hash only depend on the
+        # chain, so they are hashed once rather than per quote.
+        self._rfq_manager = RFQ_MANAGERS.get(chain_id)
+        self._rfq_manager_addr: Optional[bytes] = None
+        self._domain_sep: Optional[bytes] = None
+        if self._rfq_manager:
+            self._rfq_manager_addr = _addr(self._rfq_manager)
+            self._domain_sep = keccak(encode(
+                ["bytes32", "bytes32", "bytes32", "uint256", "address"],
+                [
+                    keccak(EIP712_DOMAIN_TYPE),
+                    keccak(b"DarkPool Pool"),
+                    keccak(b"1"),
+                    chain_id,
+                    self._rfq_manager_addr,
+                ],
+            ))
+        self._mmquote_typehash = keccak(MMQUOTE_TYPE)
         
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self.session_id: Optional[str] = None
         self.config = ConnectionConfig()
         
         self.pairs: Dict[str, TradingPair] = {}
+        self._pairs_list: List[TradingPair] = []
+        # (token_in, token_out) -> (pair, token_in is base token)
+        self._pair_index: Dict[Tuple[bytes, bytes], Tuple[TradingPair, bool]] = {}
+        wrapped = WRAPPED_TOKENS.get(chain_id)
+        self._wrapped_addr = _addr(wrapped) if wrapped else ZERO_ADDR
         self.price_callback: Optional[Callable] = None
+        self.scaled_price_callback: Optional[Callable] = None
+        
+        # Signing is pure CPU; keep it off the event loop. The pool lives
+        # from start() to stop() so a stopped connector can be restarted.
+        self._sign_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Quote requests are handled concurrently, bounded by a semaphore
+        self._inflight: Set[asyncio.Task] = set()
+        self._quote_slots = asyncio.Semaphore(max_concurrent_quotes)
         
         self._running = False
         self._depth_task: Optional[asyncio.Task] = None
-        self._heartbeat_task: Optional[asyncio.Task] = None
+        
+        # Heartbeats are timed on their own thread and event loop so a busy
+        # main loop cannot delay them past the hub's timeout
+        self._main_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        
+        # All socket writes go through a single writer task. Quote and
+        # heartbeat frames are queued in order; depth keeps only the latest
+        # snapshot per pair so a slow link never builds a stale backlog.
+        self._tx: asyncio.Queue = asyncio.Queue(maxsize=TX_QUEUE_SIZE)
+        self._latest_depth: Dict[str, str] = {}
+        self._tx_wake = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
         self._reconnect_delay = 1
         self._max_reconnect_delay = 60
         
@@ -153,22 +380,55 @@ class DeluthiumMMConnector:
 
     def add_pair(self, pair: TradingPair) -> None:
         """Add a trading pair to market make."""
-        pair_id = f"{pair.base_token}-{pair.quote_token}"
-        self.pairs[pair_id] = pair
-        logger.info(f"Added pair: {pair_id}")
+        self._index_pair(pair)
+        self.pairs[pair.pair_id] = pair
+        self._pairs_list = list(self.pairs.values())
+        logger.info(f"Added pair: {pair.pair_id}")
+
+    def remove_pair(self, pair_id: str) -> None:
+        """Stop market making a trading pair."""
+        del self.pairs[pair_id]
+        self._pairs_list = list(self.pairs.values())
+        self._pair_index = {}
+        for pair in self._pairs_list:
+            self._index_pair(pair)
+        self._latest_depth.pop(pair_id, None)
+        logger.info(f"Removed pair: {pair_id}")
+
+    def _index_pair(self, pair: TradingPair) -> None:
+        """Register both quote directions of a pair for lookup."""
+        self._pair_index[(pair.base_addr, pair.quote_addr)] = (pair, True)
+        self._pair_index.setdefault(
+            (pair.quote_addr, pair.base_addr), (pair, False)
+        )
 
-    def set_price_callback(self, callback: Callable[[str, str], Decimal]) -> None:
+    def refresh_levels(self, pair_id: str) -> None:
+        """Recompute cached depth levels after a pair's levels are edited."""
+        self.pairs[pair_id]._prepare_levels()
+
+    def set_price_callback(
+        self,
+        callback: Callable[[str, str], Decimal],
+        scaled_callback: Optional[Callable[[str, str], int]] = None,
+    ) -> None:
         """
         Set callback function to get mid prices.
         
         Args:
             callback: Function(base_token, quote_token) -> mid_price
+            scaled_callback: Optional Function(base_token, quote_token) ->
+                mid_price * 1e18 as an int; used for quotes when given
         """
         self.price_callback = callback
+        self.scaled_price_callback = scaled_callback
 
     async def start(self) -> None:
         """Start the market maker connector."""
         self._running = True
+        if self._sign_pool is None:
+            self._sign_pool = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="quote-signer"
+            )
         while self._running:
             try:
                 await self._connect_and_run()
@@ -185,18 +445,28 @@ class DeluthiumMMConnector:
     async def stop(self) -> None:
         """Stop the market maker connector."""
         self._running = False
-        if self._depth_task:
-            self._depth_task.cancel()
-        if self._heartbeat_task:
-            self._heartbeat_task.cancel()
+        self._cancel_connection_tasks()
+        for task in list(self._inflight):
+            task.cancel()
+        await asyncio.gather(*self._inflight, return_exceptions=True)
         if self.ws:
             await self.ws.close()
+        if self._sign_pool is not None:
+            self._sign_pool.shutdown(wait=False, cancel_futures=True)
+            self._sign_pool = None
 
     async def _connect_and_run(self) -> None:
         """Connect to WebSocket and handle messages."""
         headers = {"Authorization": f"Bearer {self.jwt_token}"}
         
-        async with websockets.connect(self.ws_url, extra_headers=headers) as ws:
+        # Protocol-level pings are disabled: the app heartbeat covers them
+        async with websockets.connect(
+            self.ws_url,
+            extra_headers=headers,
+            compression=self.compression,
+            max_size=2**20,
+            ping_interval=None,
+        ) as ws:
             self.ws = ws
             self._reconnect_delay = 1  # Reset on successful connection
             logger.info("Connected to Deluthium WebSocket hub")
@@ -204,18 +474,100 @@ class DeluthiumMMConnector:
             # Wait for connection acknowledgment
             await self._handle_connection_ack()
             
-            # Start background tasks
+            # Start background tasks, never leaving a previous set running
+            self._cancel_connection_tasks()
+            self._tx = asyncio.Queue(maxsize=TX_QUEUE_SIZE)
+            self._latest_depth = {}
+            self._tx_wake.clear()
+            self._writer_task = asyncio.create_task(self._writer())
             self._depth_task = asyncio.create_task(self._depth_push_loop())
-            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+            self._start_heartbeat_thread()
             
             # Main message loop
-            async for message in ws:
-                await self._handle_message(message)
+            try:
+                async for message in ws:
+                    await self._handle_message(message)
+            finally:
+                self._cancel_connection_tasks()
+
+    def _cancel_connection_tasks(self) -> None:
+        """Cancel the per-connection writer, depth, quote and heartbeat workers."""
+        for task in (self._writer_task, self._depth_task):
+            if task and not task.done():
+                task.cancel()
+        # Quotes answer on the connection they arrived on; never a later one
+        for task in self._inflight:
+            task.cancel()
+        self._stop_heartbeat_thread()
+
+    def _can_send(self) -> bool:
+        """Whether the socket is open for writing."""
+        return self.ws is not None and not self.ws.closed
+
+    async def _writer(self) -> None:
+        """Drain outbound frames onto the socket as its only writer."""
+        # A frame that cannot be written within a quote timeout means the
+        # link is stuck; drop it and let start() reconnect.
+        timeout = self.config.quote_timeout_ms / 1000
+        while True:
+            await self._tx_wake.wait()
+            self._tx_wake.clear()
+            
+            while True:
+                # Queued quote/heartbeat frames always go before depth
+                if not self._tx.empty():
+                    frame = self._tx.get_nowait()
+                    is_depth = False
+                elif self._latest_depth:
+                    pair_id = next(iter(self._latest_depth))
+                    frame = self._latest_depth.pop(pair_id)
+                    is_depth = True
+                else:
+                    break
+                
+                send = asyncio.ensure_future(self.ws.send(frame))
+                # Outlives us on timeout/cancel; mark its error as retrieved
+                send.add_done_callback(_consume_result)
+                try:
+                    # Shielded so a timeout never cuts a frame in half
+                    await asyncio.wait_for(asyncio.shield(send), timeout=timeout)
+                except websockets.ConnectionClosed:
+                    return
+                except asyncio.TimeoutError:
+                    logger.error("Send timed out, dropping connection")
+                    self.ws.transport.abort()
+                    return
+                except Exception as e:
+                    logger.error(f"Send error: {e}")
+                    continue
+                if is_depth:
+                    self.metrics["depth_pushes"] += 1
+
+    def _enqueue(self, message: dict) -> bool:
+        """Serialize and queue a message for the writer."""
+        return self._enqueue_frame(_dumps(message))
+
+    def _enqueue_frame(self, frame: str) -> bool:
+        """Queue a serialized frame; drops it if closed or the queue is full."""
+        if not self._can_send():
+            return False
+        try:
+            self._tx.put_nowait(frame)
+        except asyncio.QueueFull:
+            logger.warning("Outbound queue full, dropping frame")
+            return False
+        self._tx_wake.set()
+        return True
+
+    def _push_depth(self, snapshot: dict) -> None:
+        """Replace any unsent depth snapshot for the same pair."""
+        self._latest_depth[snapshot["pair_id"]] = _dumps(snapshot)
+        self._tx_wake.set()
 
     async def _handle_connection_ack(self) -> None:
         """Handle initial connection acknowledgment."""
         message = await self.ws.recv()
-        data = json.loads(message)
+        data = orjson.loads(message)
         
         if data.get("type") == "auth_response":
             if data.get("success"):
@@ -235,23 +587,35 @@ class DeluthiumMMConnector:
             else:
                 raise Exception(f"Auth failed: {data.get('error_message')}")
 
-    async def _handle_message(self, raw_message: str) -> None:
+    async def _handle_message(self, raw_message: Union[str, bytes]) -> None:
         """Route incoming messages to appropriate handlers."""
+        # Heartbeat pings are frequent and trivial; answer them unparsed.
+        # Binary frames skip this and go through the full parse below.
+        if (
+            isinstance(raw_message, str)
+            and raw_message.startswith(HEARTBEAT_PREFIX)
+            and HEARTBEAT_PING in raw_message
+        ):
+            self._send_heartbeat_pong()
+            return
+        
         try:
-            data = json.loads(raw_message)
+            data = orjson.loads(raw_message)
             msg_type = data.get("type")
             
             if msg_type == MessageType.QUOTE_REQUEST:
-                await self._handle_quote_request(data)
+                task = asyncio.create_task(self._handle_quote_request(data))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
             elif msg_type == MessageType.HEARTBEAT:
                 if data.get("heartbeat", {}).get("ping"):
-                    await self._send_heartbeat_pong()
+                    self._send_heartbeat_pong()
             elif msg_type == MessageType.ERROR:
                 logger.error(f"Server error: {data.get('message')}")
             else:
                 logger.debug(f"Unhandled message type: {msg_type}")
                 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse message: {e}")
         except Exception as e:
             logger.error(f"Error handling message: {e}")
@@ -260,19 +624,34 @@ class DeluthiumMMConnector:
         """Handle incoming quote request."""
         self.metrics["quotes_received"] += 1
         
+        async with self._quote_slots:
+            await self._process_quote_request(data)
+
+    async def _process_quote_request(self, data: dict) -> None:
+        """Price, sign and answer a single quote request."""
         try:
-            request = QuoteRequest(
-                quote_id=data["quote_id"],
-                chain_id=data["chain_id"],
-                mm_id=data["mm_id"],
-                token_in=data["token_in"],
-                token_out=data["token_out"],
-                amount_in=data["amount_in"],
-                recipient=data["recipient"],
-                nonce=data["nonce"],
-                deadline=data["deadline"],
-                slippage_bps=data.get("slippage_bps", 50),
-            )
+            try:
+                request = QuoteRequest(
+                    quote_id=data["quote_id"],
+                    chain_id=data["chain_id"],
+                    mm_id=data["mm_id"],
+                    token_in=data["token_in"],
+                    token_out=data["token_out"],
+                    amount_in=data["amount_in"],
+                    recipient=data["recipient"],
+                    nonce=data["nonce"],
+                    deadline=data["deadline"],
+                    slippage_bps=data.get("slippage_bps", 50),
+                )
+            except ValueError as e:
+                # Malformed token or recipient address
+                logger.warning(f"Bad quote request {data.get('quote_id')}: {e}")
+                self._send_reject(
+                    data.get("quote_id", ""),
+                    RejectReason.UNSUPPORTED_PAIR,
+                    "Invalid address"
+                )
+                return
             
             logger.info(
                 f"Quote request: {request.quote_id} "
@@ -280,19 +659,20 @@ class DeluthiumMMConnector:
             )
             
             # Find matching pair
-            pair = self._find_pair(request.token_in, request.token_out)
-            if not pair:
-                await self._send_reject(
+            match = self._find_pair(request.token_in_addr, request.token_out_addr)
+            if not match:
+                self._send_reject(
                     request.quote_id,
                     RejectReason.UNSUPPORTED_PAIR,
                     "Pair not supported"
                 )
                 return
+            pair, sells_base = match
             
             # Calculate quote
-            amount_out = self._calculate_quote(request, pair)
+            amount_out = self._calculate_quote(request, pair, sells_base)
             if amount_out is None:
-                await self._send_reject(
+                self._send_reject(
                     request.quote_id,
                     RejectReason.INSUFFICIENT_LIQUIDITY,
                     "Cannot provide quote"
@@ -300,172 +680,133 @@ class DeluthiumMMConnector:
                 return
             
             # Sign and respond
-            await self._send_quote_response(request, str(amount_out))
-            self.metrics["quotes_responded"] += 1
+            if await self._send_quote_response(request, amount_out):
+                self.metrics["quotes_responded"] += 1
             
         except Exception as e:
             logger.error(f"Error handling quote: {e}")
-            await self._send_reject(
+            self._send_reject(
                 data.get("quote_id", ""),
                 RejectReason.INTERNAL_ERROR,
                 str(e)
             )
 
     def _find_pair(
-        self, token_in: str, token_out: str
-    ) -> Optional[TradingPair]:
-        """Find matching trading pair."""
-        # Normalize zero address to wrapped token
-        wrapped = WRAPPED_TOKENS.get(self.chain_id, "")
-        if token_in == ZERO_ADDRESS:
-            token_in = wrapped
-        if token_out == ZERO_ADDRESS:
-            token_out = wrapped
-            
-        # Try both directions
-        pair_id = f"{token_in}-{token_out}"
-        if pair_id in self.pairs:
-            return self.pairs[pair_id]
+        self, token_in: bytes, token_out: bytes
+    ) -> Optional[Tuple[TradingPair, bool]]:
+        """
+        Find matching trading pair in either direction.
         
-        reverse_id = f"{token_out}-{token_in}"
-        if reverse_id in self.pairs:
-            return self.pairs[reverse_id]
+        Returns:
+            (pair, sells_base) where sells_base is True when token_in is
+            the pair's base token, or None if no pair matches.
+        """
+        # Normalize zero address to wrapped token
+        if token_in == ZERO_ADDR:
+            token_in = self._wrapped_addr
+        if token_out == ZERO_ADDR:
+            token_out = self._wrapped_addr
         
-        return None
+        return self._pair_index.get((token_in, token_out))
 
     def _calculate_quote(
-        self, request: QuoteRequest, pair: TradingPair
+        self, request: QuoteRequest, pair: TradingPair, sells_base: bool
     ) -> Optional[int]:
         """Calculate output amount for quote request."""
-        try:
-            amount_in = Decimal(request.amount_in)
-            
-            # Check order size limits
-            if amount_in < pair.min_order_size * Decimal(10**18):
-                return None
-            if amount_in > pair.max_order_size * Decimal(10**18):
-                return None
-            
-            # Get mid price
-            if self.price_callback:
-                mid_price = self.price_callback(
-                    request.token_in, request.token_out
-                )
-            else:
-                # Fallback: assume 1:1 for demo
-                mid_price = Decimal("1.0")
-            
-            # Determine spread based on direction
-            wrapped = WRAPPED_TOKENS.get(self.chain_id, "")
-            token_in_normalized = (
-                wrapped if request.token_in == ZERO_ADDRESS 
-                else request.token_in
-            )
-            
-            if token_in_normalized.lower() == pair.base_token.lower():
-                # Selling base token -> use bid spread
-                spread_bps = pair.bid_spread_bps
-            else:
-                # Buying base token -> use ask spread
-                spread_bps = pair.ask_spread_bps
-            
-            # Apply spread
-            spread_factor = Decimal(1) - Decimal(spread_bps) / Decimal(10000)
-            amount_out = amount_in * mid_price * spread_factor
-            
-            return int(amount_out)
-            
-        except Exception as e:
-            logger.error(f"Quote calculation error: {e}")
+        amount_in = int(request.amount_in)
+        
+        # Check order size limits
+        if amount_in < pair._min_wei or amount_in > pair._max_wei:
             return None
+        
+        # Get mid price in 1e18 fixed point
+        if self.scaled_price_callback:
+            mid_wei = self.scaled_price_callback(
+                request.token_in, request.token_out
+            )
+        elif self.price_callback:
+            mid_price = self.price_callback(
+                request.token_in, request.token_out
+            )
+            with localcontext(DEC_CTX):
+                mid_wei = int(mid_price * WEI)
+        else:
+            # Fallback: assume 1:1 for demo
+            mid_wei = 10**18
+        
+        # Determine spread based on direction
+        if sells_base:
+            # Selling base token -> use bid spread
+            spread_bps = pair.bid_spread_bps
+        else:
+            # Buying base token -> use ask spread
+            spread_bps = pair.ask_spread_bps
+        
+        # Apply spread
+        return (amount_in * mid_wei * (10000 - spread_bps)) // (10000 * 10**18)
 
     async def _send_quote_response(
-        self, request: QuoteRequest, amount_out: str
-    ) -> None:
-        """Sign and send quote response."""
-        rfq_manager = RFQ_MANAGERS.get(self.chain_id)
+        self, request: QuoteRequest, amount_out: int
+    ) -> bool:
+        """Sign and send quote response; False if the frame was dropped."""
+        rfq_manager = self._rfq_manager
         if not rfq_manager:
             raise ValueError(f"Unknown chain ID: {self.chain_id}")
         
-        # Build EIP-712 signature
-        domain = {
-            "name": "DarkPool Pool",
-            "version": "1",
-            "chainId": self.chain_id,
-            "verifyingContract": rfq_manager,
-        }
+        amount_in = int(request.amount_in)
+        nonce = int(request.nonce)
         
-        types = {
-            "MMQuote": [
-                {"name": "manager", "type": "address"},
-                {"name": "from", "type": "address"},
-                {"name": "to", "type": "address"},
-                {"name": "inputToken", "type": "address"},
-                {"name": "outputToken", "type": "address"},
-                {"name": "amountIn", "type": "uint256"},
-                {"name": "amountOut", "type": "uint256"},
-                {"name": "deadline", "type": "uint256"},
-                {"name": "nonce", "type": "uint256"},
-                {"name": "extraDataHash", "type": "bytes32"},
-            ]
-        }
-        
-        # Hash of empty extra data
-        extra_data_hash = (
-            "0xc5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+        struct_hash = keccak(self._mmquote_typehash + encode(
+            MMQUOTE_ABI_TYPES,
+            (
+                self._rfq_manager_addr,
+                request.recipient_addr,
+                request.recipient_addr,
+                request.token_in_addr,
+                request.token_out_addr,
+                amount_in,
+                amount_out,
+                request.deadline,
+                nonce,
+                EXTRA_DATA_HASH,
+            ),
+        ))
+        loop = asyncio.get_running_loop()
+        signature = await loop.run_in_executor(
+            self._sign_pool, self._sign_quote, struct_hash
         )
         
-        message = {
-            "manager": rfq_manager,
-            "from": request.recipient,
-            "to": request.recipient,
-            "inputToken": request.token_in,
-            "outputToken": request.token_out,
-            "amountIn": int(request.amount_in),
-            "amountOut": int(amount_out),
-            "deadline": request.deadline,
-            "nonce": int(request.nonce),
-            "extraDataHash": extra_data_hash,
-        }
-        
-        # Sign the typed data
-        signable = encode_typed_data(
-            domain_data=domain,
-            message_types=types,
-            message_data=message,
-        )
-        signed = self.signer.sign_message(signable)
-        signature = signed.signature.hex()
-        
-        response = {
-            "type": MessageType.QUOTE_RESPONSE,
-            "quote_id": request.quote_id,
-            "status": QuoteStatus.SUCCESS,
-            "order": {
-                "signer": self.signer.address,
-                "manager": rfq_manager,
-                "from": request.recipient,
-                "to": request.recipient,
-                "input_token": request.token_in,
-                "output_token": request.token_out,
-                "amount_in": request.amount_in,
-                "amount_out": amount_out,
-                "deadline": request.deadline,
-                "nonce": request.nonce,
-                "extra_data": "0x",
-                "signature": f"0x{signature}",
-            }
-        }
-        
-        await self.ws.send(json.dumps(response))
-        logger.info(f"Quote response sent: {request.quote_id}")
+        sent = self._enqueue_frame(QUOTE_RESPONSE_TEMPLATE % (
+            orjson.dumps(request.quote_id).decode(),
+            self.signer.address,
+            rfq_manager,
+            request.recipient_addr.hex(),
+            request.recipient_addr.hex(),
+            request.token_in_addr.hex(),
+            request.token_out_addr.hex(),
+            amount_in,
+            amount_out,
+            request.deadline,
+            nonce,
+            signature.hex(),
+        ))
+        if sent:
+            logger.info(f"Quote response sent: {request.quote_id}")
+        else:
+            logger.warning(f"Quote response dropped: {request.quote_id}")
+        return sent
+
+    def _sign_quote(self, struct_hash: bytes) -> bytes:
+        """Sign an MMQuote struct hash as an EIP-712 digest (runs off-loop)."""
+        digest = keccak(b"\x19\x01" + self._domain_sep + struct_hash)
+        sig = self._signing_key.sign_recoverable(digest, hasher=None)
+        # r || s || v with Ethereum's 27/28 recovery id
+        return sig[:64] + bytes((sig[64] + 27,))
 
-    async def _send_reject(
+    def _send_reject(
         self, quote_id: str, reason: RejectReason, message: str
     ) -> None:
         """Send quote rejection."""
-        self.metrics["quotes_rejected"] += 1
-        
         reject = {
             "type": MessageType.QUOTE_REJECT,
             "quote_id": quote_id,
@@ -473,23 +814,31 @@ class DeluthiumMMConnector:
             "message": message,
         }
         
-        await self.ws.send(json.dumps(reject))
+        if not self._enqueue(reject):
+            logger.warning(f"Quote reject dropped: {quote_id} - {reason.value}")
+            return
+        self.metrics["quotes_rejected"] += 1
         logger.info(f"Quote rejected: {quote_id} - {reason.value}")
 
     async def _depth_push_loop(self) -> None:
         """Periodically push order book depth."""
         interval = self.config.depth_push_interval_ms / 1000
         sequence_id = 0
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         
         while self._running:
             try:
-                for pair_id, pair in self.pairs.items():
-                    depth = self._build_depth_snapshot(pair, sequence_id)
-                    await self.ws.send(json.dumps(depth))
-                    self.metrics["depth_pushes"] += 1
-                    sequence_id += 1
-                    
-                await asyncio.sleep(interval)
+                # Skip ticks while disconnected instead of raising
+                if self._can_send():
+                    # One sequence_id per depth_update message
+                    for pair in self._pairs_list:
+                        self._push_depth(
+                            self._build_depth_snapshot(pair, sequence_id)
+                        )
+                        sequence_id += 1
+                
+                next_tick = await _next_tick(loop, next_tick, interval)
                 
             except asyncio.CancelledError:
                 break
@@ -509,84 +858,83 @@ class DeluthiumMMConnector:
         
         bids = []
         asks = []
+        with localcontext(DEC_CTX):
+            for bid_factor, ask_factor, amount in zip(
+                pair._bid_factors, pair._ask_factors, pair._amount_wei
+            ):
+                bids.append({"price": mid_price * bid_factor, "amount": amount})
+                asks.append({"price": mid_price * ask_factor, "amount": amount})
         
-        if pair.levels:
-            # Multi-level order book
-            for level in pair.levels:
-                spread_bps = level.get("spread_bps", 30)
-                amount = Decimal(str(level.get("amount", "1.0")))
-                
-                bid_price = mid_price * (1 - Decimal(spread_bps) / 10000)
-                ask_price = mid_price * (1 + Decimal(spread_bps) / 10000)
-                
-                bids.append({
-                    "price": str(bid_price),
-                    "amount": str(int(amount * Decimal(10**18)))
-                })
-                asks.append({
-                    "price": str(ask_price),
-                    "amount": str(int(amount * Decimal(10**18)))
-                })
-        else:
-            # Single level
-            bid_price = mid_price * (1 - Decimal(pair.bid_spread_bps) / 10000)
-            ask_price = mid_price * (1 + Decimal(pair.ask_spread_bps) / 10000)
-            
-            bids.append({
-                "price": str(bid_price),
-                "amount": str(int(pair.order_amount * Decimal(10**18)))
-            })
-            asks.append({
-                "price": str(ask_price),
-                "amount": str(int(pair.order_amount * Decimal(10**18)))
-            })
-        
-        # Sort: bids descending, asks ascending
-        bids.sort(key=lambda x: Decimal(x["price"]), reverse=True)
-        asks.sort(key=lambda x: Decimal(x["price"]))
-        
-        return {
-            "type": MessageType.DEPTH_UPDATE,
-            "chain_id": pair.chain_id,
-            "pair_id": f"{pair.base_token}-{pair.quote_token}",
-            "token_a": pair.base_token,
-            "token_b": pair.quote_token,
-            "bids": bids,
-            "asks": asks,
-            "sequence_id": sequence_id,
-            "timestamp": int(time.time() * 1000),
-        }
+        snapshot = pair._template_copy()
+        snapshot["bids"] = bids
+        snapshot["asks"] = asks
+        snapshot["sequence_id"] = sequence_id
+        snapshot["timestamp"] = time.time_ns() // 1_000_000
+        return snapshot
+
+    def _start_heartbeat_thread(self) -> None:
+        """Start heartbeats on a dedicated thread and event loop."""
+        self._main_loop = asyncio.get_running_loop()
+        self._heartbeat_loop = asyncio.new_event_loop()
+        self._heartbeat_thread = threading.Thread(
+            target=self._run_heartbeat_thread,
+            args=(self._heartbeat_loop,),
+            name="heartbeat",
+            daemon=True,
+        )
+        self._heartbeat_thread.start()
 
-    async def _heartbeat_loop(self) -> None:
-        """Send periodic heartbeats."""
-        interval = self.config.heartbeat_interval_ms / 1000
-        
-        while self._running:
+    def _run_heartbeat_thread(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Run the heartbeat event loop until _stop_heartbeat_thread."""
+        self._schedule_heartbeat(loop, loop.time())
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def _stop_heartbeat_thread(self) -> None:
+        """Ask the heartbeat thread to exit; does not wait for it."""
+        # No join: this runs on the main loop, and the old thread only
+        # touches its own loop and deadline, so it cannot clash with the
+        # next connection's thread while it winds down
+        loop = self._heartbeat_loop
+        if loop and not loop.is_closed():
             try:
-                await asyncio.sleep(interval)
-                await self._send_heartbeat()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Heartbeat error: {e}")
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                # Closed between the check and the call
+                pass
+        self._heartbeat_loop = None
+        self._heartbeat_thread = None
+
+    def _schedule_heartbeat(
+        self, loop: asyncio.AbstractEventLoop, deadline: float
+    ) -> None:
+        """Arm the fixed-rate heartbeat tick after deadline (heartbeat thread)."""
+        interval = self.config.heartbeat_interval_ms / 1000
+        next_deadline = max(deadline + interval, loop.time())
+        loop.call_at(next_deadline, self._send_heartbeat, loop, next_deadline)
 
-    async def _send_heartbeat(self) -> None:
-        """Send heartbeat ping."""
-        heartbeat = {
-            "type": MessageType.HEARTBEAT,
-            "heartbeat": {"ping": True},
-            "timestamp": int(time.time() * 1000),
-        }
-        await self.ws.send(json.dumps(heartbeat))
+    def _send_heartbeat(
+        self, loop: asyncio.AbstractEventLoop, deadline: float
+    ) -> None:
+        """Hand a heartbeat ping to the main loop's writer (heartbeat thread)."""
+        frame = HEARTBEAT_TEMPLATE % (time.time_ns() // 1_000_000)
+        try:
+            self._main_loop.call_soon_threadsafe(self._enqueue_frame, frame)
+        except RuntimeError:
+            # Main loop already closed
+            return
+        self._schedule_heartbeat(loop, deadline)
 
-    async def _send_heartbeat_pong(self) -> None:
+    def _send_heartbeat_pong(self) -> None:
         """Respond to heartbeat ping."""
         pong = {
             "type": MessageType.HEARTBEAT,
             "heartbeat": {"pong": True},
-            "timestamp": int(time.time() * 1000),
+            "timestamp": time.time_ns() // 1_000_000,
         }
-        await self.ws.send(json.dumps(pong))
+        self._enqueue(pong)
 
     def get_metrics(self) -> dict:
         """Return current metrics."""
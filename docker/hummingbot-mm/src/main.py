@@ -17,102 +17,292 @@ Environment Variables:
 
 import argparse
 import asyncio
+import functools
+import hashlib
 import logging
+import logging.handlers
 import os
+import queue
 import signal
 import sys
+import tomllib
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Optional, TextIO, Tuple, Union
 
-import yaml
+# libuv-backed event loop, when installed
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from connector import DeluthiumMMConnector, TradingPair
+from prebuild_config import TOML_SOURCE_KEY
+
+# Records buffered for the log writer thread; beyond this they are dropped
+LOG_QUEUE_SIZE = 10000
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of reporting a full queue."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Route all logging through a bounded queue.
+    
+    The event loop only enqueues records; stdout and file writes happen on
+    the returned listener's thread. The caller starts and stops it.
+    """
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if os.path.exists("/logs"):
+        handlers.append(logging.FileHandler("/logs/hummingbot_mm.log"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.handlers[:] = [_DroppingQueueHandler(log_queue)]
+    return logging.handlers.QueueListener(log_queue, *handlers)
+
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("/logs/hummingbot_mm.log") if os.path.exists("/logs") else logging.NullHandler(),
-    ]
-)
 logger = logging.getLogger("deluthium_mm")
 
+# Fixed-point scale for integer prices (token wei convention)
+PRICE_SCALE = 10**18
+
+
+@dataclass(slots=True, frozen=True)
+class Env:
+    """Environment variables read by the MM, captured once at startup."""
+    jwt_token: Optional[str]
+    signer_key: Optional[str]
+    chain_id: Optional[str]
+    ws_url: Optional[str]
+    
+    @classmethod
+    def from_environ(cls) -> "Env":
+        environ = os.environ
+        return cls(
+            jwt_token=environ.get("DELUTHIUM_JWT"),
+            signer_key=environ.get("MM_SIGNER_KEY"),
+            chain_id=environ.get("DELUTHIUM_CHAIN_ID"),
+            ws_url=environ.get("WS_URL"),
+        )
+
+
+ENV = Env.from_environ()
+
+
+@functools.lru_cache(maxsize=1024)
+def _warn_missing_price(base_token: str, quote_token: str) -> None:
+    """Log a missing pair once instead of on every lookup."""
+    logger.warning(f"No price for {base_token}-{quote_token}, using 1.0")
+
 
 class PriceFeed:
     """Simple price feed - replace with real implementation."""
     
+    __slots__ = ("source", "config", "_prices", "_inverse", "_prices_scaled", "_default")
+    
     def __init__(self, source: str = "static", config: dict = None):
         self.source = source
         self.config = config or {}
-        self._prices: dict = {}
+        # Keyed by (base, quote); _inverse holds the derived reverse prices
+        self._prices: Dict[Tuple[str, str], Decimal] = {}
+        self._inverse: Dict[Tuple[str, str], Decimal] = {}
+        # Both directions as int fixed point (price * PRICE_SCALE)
+        self._prices_scaled: Dict[Tuple[str, str], int] = {}
+        # Returned for pairs with no price
+        self._default = Decimal("1.0")
         
     async def start(self) -> None:
         """Start price feed updates."""
         if self.source == "static":
-            # Use static prices from config
-            for pair in self.config.get("pairs", []):
-                key = f"{pair.get('base')}-{pair.get('quote')}"
-                self._prices[key] = Decimal(str(pair.get("price", "1.0")))
+            # Use static prices from config; the new entries are built in
+            # one pass and merged in rather than set_price()'d one by one
+            prices = {
+                (sys.intern(pair.get("base")), sys.intern(pair.get("quote"))):
+                    Decimal(str(pair.get("price", "1.0")))
+                for pair in self.config.get("pairs", [])
+            }
+            scaled = {key: int(price * PRICE_SCALE) for key, price in prices.items()}
+            self._prices.update(prices)
+            self._inverse.update(
+                ((quote, base), Decimal("1") / price)
+                for (base, quote), price in prices.items()
+            )
+            self._prices_scaled.update(scaled)
+            # Same precedence as set_price(): an explicit price, set earlier
+            # or in this config, beats the derived reverse
+            self._prices_scaled.update(
+                ((quote, base), PRICE_SCALE * PRICE_SCALE // value)
+                for (base, quote), value in scaled.items()
+                if (quote, base) not in self._prices
+            )
         elif self.source == "binance":
             # TODO: Implement Binance price feed
             logger.info("Binance price feed not implemented, using fallback")
         
     def get_price(self, base_token: str, quote_token: str) -> Decimal:
         """Get mid price for a token pair."""
-        key = f"{base_token}-{quote_token}"
-        if key in self._prices:
-            return self._prices[key]
+        key = (base_token, quote_token)
+        price = self._prices.get(key)
+        if price is not None:
+            return price
         
         # Try reverse
-        reverse_key = f"{quote_token}-{base_token}"
-        if reverse_key in self._prices:
-            return Decimal("1") / self._prices[reverse_key]
+        price = self._inverse.get(key)
+        if price is not None:
+            return price
         
         # Fallback
-        logger.warning(f"No price for {key}, using 1.0")
-        return Decimal("1.0")
+        _warn_missing_price(base_token, quote_token)
+        return self._default
+    
+    def get_price_scaled(self, base_token: str, quote_token: str) -> int:
+        """Get mid price for a token pair as price * PRICE_SCALE."""
+        price = self._prices_scaled.get((base_token, quote_token))
+        if price is not None:
+            return price
+        
+        # Fallback
+        _warn_missing_price(base_token, quote_token)
+        return PRICE_SCALE
     
     def set_price(self, base_token: str, quote_token: str, price: Decimal) -> None:
         """Manually set price for testing."""
-        key = f"{base_token}-{quote_token}"
+        key = (base_token, quote_token)
+        reverse = (quote_token, base_token)
+        scaled = int(price * PRICE_SCALE)
+        
         self._prices[key] = price
+        self._inverse[reverse] = Decimal("1") / price
+        self._prices_scaled[key] = scaled
+        # An explicitly set reverse price wins over the derived one
+        if reverse not in self._prices:
+            self._prices_scaled[reverse] = PRICE_SCALE * PRICE_SCALE // scaled
 
 
-def load_config(config_path: str) -> dict:
-    """Load configuration from YAML file."""
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+# Parsed configs keyed by (path, mtime_ns, size)
+_config_cache: dict = {}
 
+# TOML copies of the image's default configs, written at build time by
+# prebuild_config.py outside the /conf volume
+PREBUILT_CONFIG_DIR = "/app/conf/strategies"
 
-def create_connector(config: dict) -> DeluthiumMMConnector:
+
+def _parse_yaml(raw: bytes) -> dict:
+    """Parse a YAML config, importing PyYAML only when it is needed."""
+    import yaml
+    
+    # Prefer the LibYAML-backed loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(raw, Loader=loader)
+
+
+def _load_prebuilt_toml(config_path: str, digest: str) -> Optional[dict]:
+    """Return the TOML copy of a YAML config if one was built from this exact file."""
+    name = os.path.splitext(os.path.basename(config_path))[0] + ".toml"
+    for toml_path in (
+        os.path.join(os.path.dirname(config_path), name),
+        os.path.join(PREBUILT_CONFIG_DIR, name),
+    ):
+        try:
+            with open(toml_path, "rb") as f:
+                config = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError):
+            continue
+        if config.pop(TOML_SOURCE_KEY, None) == digest:
+            return config
+    return None
+
+
+def load_config(config: Union[str, TextIO]) -> dict:
+    """
+    Load configuration from YAML file.
+    
+    Accepts a path or an open text file (as argparse.FileType provides);
+    a file object is closed once loaded.
+    
+    A TOML copy generated at image build time is read instead, using the
+    C-backed tomllib, when the sha256 it records matches the YAML's
+    contents. Either way the result is memoized in-process, keyed by the
+    file's mtime and size, so repeat loads of an unchanged file skip parsing.
+    """
+    if isinstance(config, str):
+        config_path = os.path.abspath(config)
+        return _load_config(config_path, os.stat(config_path), None)
+    
+    with config:
+        return _load_config(
+            os.path.abspath(config.name), os.fstat(config.fileno()), config
+        )
+
+
+def _load_config(
+    config_path: str, st: os.stat_result, config_file: Optional[TextIO]
+) -> dict:
+    """Resolve a config from the in-process cache, a matching TOML or YAML."""
+    key = (config_path, st.st_mtime_ns, st.st_size)
+    if key in _config_cache:
+        return _config_cache[key]
+    
+    if config_file is not None:
+        raw = config_file.buffer.read()
+    else:
+        with open(config_path, "rb") as f:
+            raw = f.read()
+    
+    if config_path.endswith(".toml"):
+        config = tomllib.loads(raw.decode())
+        config.pop(TOML_SOURCE_KEY, None)
+    else:
+        config = _load_prebuilt_toml(config_path, hashlib.sha256(raw).hexdigest())
+        if config is None:
+            config = _parse_yaml(raw)
+    
+    _config_cache[key] = config
+    return config
+
+
+def create_connector(config: dict, env: Env) -> DeluthiumMMConnector:
     """Create and configure the MM connector."""
     # Get credentials from environment
-    jwt_token = os.environ.get("DELUTHIUM_JWT")
-    signer_key = os.environ.get("MM_SIGNER_KEY")
+    jwt_token = env.jwt_token
+    signer_key = env.signer_key
     
     if not jwt_token:
         raise ValueError("DELUTHIUM_JWT environment variable is required")
     if not signer_key:
         raise ValueError("MM_SIGNER_KEY environment variable is required")
     
-    chain_id = int(os.environ.get("DELUTHIUM_CHAIN_ID", config.get("chain_id", 56)))
-    ws_url = os.environ.get("WS_URL", config.get("ws_url", "wss://mmhub.deluthium.ai/ws"))
+    # Environment overrides the config file
+    chain_id = int(env.chain_id if env.chain_id is not None else config.get("chain_id", 56))
+    ws_url = env.ws_url if env.ws_url is not None else config.get("ws_url", "wss://mmhub.deluthium.ai/ws")
     
     connector = DeluthiumMMConnector(
         jwt_token=jwt_token,
         signer_key=signer_key,
         chain_id=chain_id,
         ws_url=ws_url,
+        compression="deflate" if config.get("ws_compression") else None,
     )
     
     # Add trading pairs
     for pair_config in config.get("pairs", []):
         pair = TradingPair(
             chain_id=chain_id,
-            base_token=pair_config["base"],
-            quote_token=pair_config["quote"],
+            base_token=sys.intern(pair_config["base"]),
+            quote_token=sys.intern(pair_config["quote"]),
             bid_spread_bps=pair_config.get("bid_spread_bps", 30),
             ask_spread_bps=pair_config.get("ask_spread_bps", 30),
             order_amount=Decimal(str(pair_config.get("order_amount", "1.0"))),
@@ -125,14 +315,15 @@ def create_connector(config: dict) -> DeluthiumMMConnector:
     return connector
 
 
-async def main(config_path: str) -> None:
+async def main(config_source: Union[str, TextIO]) -> None:
     """Main entry point."""
     logger.info("=" * 50)
     logger.info("Deluthium Market Maker - Hummingbot WebSocket")
     logger.info("=" * 50)
     
     # Load configuration
-    config = load_config(config_path)
+    config_path = getattr(config_source, "name", config_source)
+    config = load_config(config_source)
     logger.info(f"Loaded config: {config_path}")
     
     # Initialize price feed
@@ -143,15 +334,18 @@ async def main(config_path: str) -> None:
     await price_feed.start()
     
     # Create connector
-    connector = create_connector(config)
-    connector.set_price_callback(price_feed.get_price)
+    connector = create_connector(config, ENV)
+    connector.set_price_callback(
+        price_feed.get_price, price_feed.get_price_scaled
+    )
     
-    # Handle shutdown
-    loop = asyncio.get_event_loop()
+    # Handle shutdown: signals only flip an event that main() awaits
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
     
     def shutdown_handler():
         logger.info("Shutdown requested...")
-        asyncio.create_task(connector.stop())
+        stop_event.set()
     
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, shutdown_handler)
@@ -161,11 +355,17 @@ async def main(config_path: str) -> None:
     logger.info(f"Pairs: {list(connector.pairs.keys())}")
     logger.info(f"WebSocket: {connector.ws_url}")
     
+    run_task = asyncio.create_task(connector.start())
+    stop_task = asyncio.create_task(stop_event.wait())
     try:
-        await connector.start()
-    except asyncio.CancelledError:
-        pass
+        await asyncio.wait(
+            {run_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+        )
     finally:
+        await connector.stop()
+        run_task.cancel()
+        stop_task.cancel()
+        await asyncio.gather(run_task, stop_task, return_exceptions=True)
         logger.info("Market Maker stopped")
         logger.info(f"Final metrics: {connector.get_metrics()}")
 
@@ -174,15 +374,18 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Deluthium Market Maker")
     parser.add_argument(
         "--config",
-        type=str,
+        type=argparse.FileType("r"),
         default="/conf/strategies/deluthium_mm.yml",
         help="Path to configuration file",
     )
     args = parser.parse_args()
     
-    # Check config exists
-    if not os.path.exists(args.config):
-        logger.error(f"Config file not found: {args.config}")
-        sys.exit(1)
-    
-    asyncio.run(main(args.config))
+    log_listener = setup_logging()
+    log_listener.start()
+    try:
+        if uvloop is not None:
+            uvloop.run(main(args.config))
+        else:
+            asyncio.run(main(args.config))
+    finally:
+        log_listener.stop()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Deluthium Market Maker - build-time config conversion
+
+Converts each strategy YAML into a TOML copy that main.py can read with the
+stdlib tomllib. Every copy records the sha256 of the YAML it was built from
+under TOML_SOURCE_KEY, and main.py only uses it for a byte-identical YAML.
+
+Usage:
+    python prebuild_config.py /conf/strategies /app/conf/strategies
+
+Requires PyYAML and tomli-w; only this module's build step needs tomli-w.
+"""
+
+import glob
+import hashlib
+import os
+import sys
+
+# Key in each TOML copy holding the sha256 of its source YAML
+TOML_SOURCE_KEY = "_source_sha256"
+
+
+def _find_null(value, path: str = "") -> str:
+    """Return the dotted path of the first None in a parsed config, or ''."""
+    if value is None:
+        return path or "<document>"
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return ""
+    for key, item in items:
+        found = _find_null(item, f"{path}.{key}" if path else str(key))
+        if found:
+            return found
+    return ""
+
+
+def convert(yaml_path: str, toml_path: str) -> None:
+    """Write the TOML copy of one YAML config."""
+    import tomli_w
+    import yaml
+
+    with open(yaml_path, "rb") as f:
+        raw = f.read()
+    config = yaml.safe_load(raw)
+
+    if not isinstance(config, dict):
+        raise SystemExit(f"{yaml_path}: top level must be a mapping")
+    null_path = _find_null(config)
+    if null_path:
+        raise SystemExit(
+            f"{yaml_path}: '{null_path}' is null, which TOML cannot represent; "
+            f"remove the key or give it a value"
+        )
+
+    config[TOML_SOURCE_KEY] = hashlib.sha256(raw).hexdigest()
+    try:
+        encoded = tomli_w.dumps(config)
+    except TypeError as e:
+        raise SystemExit(f"{yaml_path}: cannot convert to TOML: {e}")
+
+    with open(toml_path, "w", encoding="utf-8") as f:
+        f.write(encoded)
+
+
+def main(source_dir: str, output_dir: str) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    for yaml_path in sorted(glob.glob(os.path.join(source_dir, "*.yml"))):
+        name = os.path.splitext(os.path.basename(yaml_path))[0] + ".toml"
+        toml_path = os.path.join(output_dir, name)
+        convert(yaml_path, toml_path)
+        print(f"{yaml_path} -> {toml_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        raise SystemExit("Usage: prebuild_config.py SOURCE_DIR OUTPUT_DIR")
+    main(sys.argv[1], sys.argv[2])
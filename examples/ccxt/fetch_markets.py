@@ -15,12 +15,6 @@ Or with Docker:
 import os
 import sys
 
-try:
-    import ccxt
-except ImportError:
-    print("Error: CCXT not installed. Run: pip install ccxt")
-    sys.exit(1)
-
 
 def main():
     # Get JWT token from environment
@@ -33,6 +27,13 @@ def main():
     # Get chain ID (default: BSC = 56)
     chain_id = int(os.environ.get("DELUTHIUM_CHAIN_ID", "56"))
 
+    # Imported only once the inputs are valid; ccxt is slow to import
+    try:
+        import ccxt
+    except ImportError:
+        print("Error: CCXT not installed. Run: pip install ccxt")
+        sys.exit(1)
+
     print(f"Connecting to Deluthium DEX (Chain ID: {chain_id})...")
     print()
 
@@ -48,19 +49,22 @@ def main():
         # Fetch markets
         markets = exchange.fetch_markets()
 
-        print(f"Found {len(markets)} trading pairs:\n")
-        print(f"{'Symbol':<20} {'Base':<10} {'Quote':<10} {'Active':<8}")
-        print("-" * 50)
-
+        # Build the whole table and write it in one go
+        lines = [
+            f"Found {len(markets)} trading pairs:\n",
+            f"{'Symbol':<20} {'Base':<10} {'Quote':<10} {'Active':<8}",
+            "-" * 50,
+        ]
         for market in markets:
             symbol = market.get("symbol", "N/A")
             base = market.get("base", "N/A")
             quote = market.get("quote", "N/A")
             active = "Yes" if market.get("active") else "No"
-            print(f"{symbol:<20} {base:<10} {quote:<10} {active:<8}")
+            lines.append(f"{symbol:<20} {base:<10} {quote:<10} {active:<8}")
+        lines.append("")
+        lines.append(f"Total: {len(markets)} pairs")
 
-        print()
-        print(f"Total: {len(markets)} pairs")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     except ccxt.AuthenticationError as e:
         print(f"Authentication Error: {e}")
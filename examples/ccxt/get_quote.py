@@ -16,15 +16,24 @@ Or with Docker:
     docker-compose run ccxt python3 examples/get_quote.py WBNB/USDT 1.0 buy
 """
 
+import functools
 import os
 import sys
 from decimal import Decimal
 
-try:
+
+@functools.lru_cache(maxsize=4)
+def create_exchange(jwt_token, chain_id, slippage):
+    """Return a shared exchange instance so repeat quotes reuse its HTTP session."""
     import ccxt
-except ImportError:
-    print("Error: CCXT not installed. Run: pip install ccxt")
-    sys.exit(1)
+
+    return ccxt.deluthium({
+        "apiKey": jwt_token,
+        "options": {
+            "defaultChainId": chain_id,
+            "defaultSlippage": slippage,
+        }
+    })
 
 
 def main():
@@ -48,19 +57,24 @@ def main():
     chain_id = int(os.environ.get("DELUTHIUM_CHAIN_ID", "56"))
     slippage = float(os.environ.get("DELUTHIUM_SLIPPAGE", "0.5"))
 
+    # Imported only once the inputs are valid; ccxt is slow to import
+    try:
+        import ccxt
+    except ImportError:
+        print("Error: CCXT not installed. Run: pip install ccxt")
+        sys.exit(1)
+
     print(f"Connecting to Deluthium DEX (Chain ID: {chain_id})...")
     print()
 
     # Initialize exchange
-    exchange = ccxt.deluthium({
-        "apiKey": jwt_token,
-        "options": {
-            "defaultChainId": chain_id,
-            "defaultSlippage": slippage,
-        }
-    })
+    exchange = create_exchange(jwt_token, chain_id, slippage)
 
     try:
+        # Load markets once; ccxt caches them on the exchange, so later
+        # quotes resolve symbols without another markets round-trip
+        exchange.load_markets()
+
         print(f"Requesting quote:")
         print(f"  Symbol: {symbol}")
         print(f"  Amount: {amount}")